@@ -2,21 +2,29 @@
 """Generate assets/arcgis_layers/index.json for the TypeScript client."""
 from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
 
+import orjson
+
 ROOT = Path(__file__).resolve().parents[1]
 LAYER_DIR = ROOT / "assets" / "arcgis_layers"
 MANIFEST_PATH = LAYER_DIR / "index.json"
 
 def build_manifest() -> None:
     LAYER_DIR.mkdir(parents=True, exist_ok=True)
-    layers = []
-    for geojson_path in sorted(LAYER_DIR.glob("*.geojson")):
-        rel_path = f"arcgis_layers/{geojson_path.name}"
-        layers.append({"name": geojson_path.stem, "file": rel_path})
+    with os.scandir(LAYER_DIR) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if entry.name.endswith(".geojson") and entry.is_file()
+        )
+    layers = [
+        {"name": name[: -len(".geojson")], "file": f"arcgis_layers/{name}"}
+        for name in names
+    ]
     manifest = {"layers": layers}
-    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+    MANIFEST_PATH.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
     print(f"Wrote {len(layers)} layer entries to {MANIFEST_PATH.relative_to(ROOT)}")
 
 if __name__ == "__main__":
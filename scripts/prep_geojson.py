@@ -7,24 +7,41 @@ Usage:
     python scripts/prep_geojson.py --sa1      # just SA1 + SEIFA merge
     python scripts/prep_geojson.py --sa1 --state "Western Australia"
                                           # SA1 filtered by STE_NAME21
+    python scripts/prep_geojson.py --sa1 --simplify 0.0001
+                                          # SA1 with ~10 m polygon simplification
     python scripts/prep_geojson.py --transit  # just transit services
     python scripts/prep_geojson.py --schools  # just school locations
+    python scripts/prep_geojson.py --force    # rebuild even if outputs look current
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import gzip
+import hashlib
 import re
 import tempfile
-import xml.etree.ElementTree as ET
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from urllib.parse import urlencode
-from urllib.request import urlopen
+from urllib.request import Request, urlopen
 from zipfile import ZipFile
 
 import geopandas as gpd
+import numpy as np
+import orjson
 import pandas as pd
+import pyogrio
+import pyproj
+from lxml import etree
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+gpd.options.io_engine = "pyogrio"
+# Arrow streaming reads need GDAL 3.6+.
+USE_ARROW = pyogrio.__gdal_version__ >= (3, 6, 0)
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -50,6 +67,17 @@ TRANSIT_OUT = OUTPUT_DIR / "transit_services.geojson"
 SCHOOLS_OUT = OUTPUT_DIR / "schools_2019.geojson"
 CATCHMENTS_OUT = OUTPUT_DIR / "school_catchments.geojson"
 ARCGIS_OUT = OUTPUT_DIR / "arcgis_layers"
+CACHE_DIR = OUTPUT_DIR / "cache"
+ARCGIS_MAX_WORKERS = 8
+
+SA1_COLUMNS = ["SA1_CODE21", "SA2_NAME21", "SA3_NAME21", "STE_NAME21"]
+SHAPEFILE_SIDECARS = (".dbf", ".shx", ".prj", ".cpg")
+
+# Trailing "(Campus)"-style qualifiers, plus any dots leading into them.
+_PAREN_SUFFIX_RE = re.compile(r"\.*\(.*$")
+
+# SEIFA rows whose first cell is a real SA1 code (11 digits in practice).
+_SA1_CODE_RE = re.compile(r"^\s*(\d{5,})\s*$")
 
 
 def _flatten_excel_columns(columns):
@@ -75,7 +103,7 @@ def _load_seifa_table(path: Path):
         path,
         sheet_name="Table 1",
         header=[4, 5],
-        engine="openpyxl",
+        engine="calamine",
     )
     df.columns = _flatten_excel_columns(df.columns)
     needed_cols = [
@@ -108,113 +136,95 @@ def _load_seifa_table(path: Path):
         print(
             f"Warning: missing SEIFA columns {missing}. Continuing with available columns."
         )
-    df = df.loc[:, available_cols].rename(columns=rename_map)
-    df = df.dropna(subset=["SA1_CODE21"])
-    df["SA1_CODE21"] = df["SA1_CODE21"].astype(str).str.strip()
-    numeric_cols = [col for col in df.columns if col != "SA1_CODE21"]
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    df = df[~df["SA1_CODE21"].str.contains("Table", na=False)]
+    columns = {}
+    for col in available_cols:
+        name = rename_map[col]
+        columns[name] = (
+            df[col] if name == "SA1_CODE21" else pd.to_numeric(df[col], errors="coerce")
+        )
+    df = pd.DataFrame(columns)
+    # Also drops blank and footer rows.
+    codes = df["SA1_CODE21"].astype(str).str.extract(_SA1_CODE_RE, expand=False)
+    keep = codes.notna()
+    return df.loc[keep].assign(SA1_CODE21=codes[keep])
+
+
+def _load_seifa_table_cached(path: Path):
+    signature = (str(path.resolve()), path.stat().st_mtime_ns)
+    digest = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()
+    cache_path = CACHE_DIR / f"seifa_{digest}.parquet"
+    if cache_path.exists():
+        return pd.read_parquet(cache_path)
+    df = _load_seifa_table(path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(cache_path, compression="zstd")
+    _prune_cache("seifa_*.parquet", cache_path)
     return df
 
 
-def _compute_school_stage(low_year: str, high_year: str):
-    low = (low_year or "").upper()
-    high = (high_year or "").upper()
+def _compute_school_stages(low_years: pd.Series, high_years: pd.Series):
+    low = low_years.astype("string").fillna("").str.upper()
+    high = high_years.astype("string").fillna("").str.upper()
 
-    def year_to_int(val: str | None):
-        if val and val.startswith("Y") and len(val) >= 3:
-            try:
-                return int(val[1:3])
-            except ValueError:
-                return None
-        return None
+    def year_to_int(vals: pd.Series):
+        is_year = vals.str.startswith("Y") & (vals.str.len() >= 3)
+        digits = vals.str.slice(1, 3).where(is_year)
+        return pd.to_numeric(digits, errors="coerce").astype("float64")
 
     low_num = year_to_int(low)
     high_num = year_to_int(high)
-    has_primary = False
-    has_secondary = False
-
-    if low in {"KIN", "PP", "P"} or high in {"KIN", "PP", "P"}:
-        has_primary = True
-
-    if low_num is not None:
-        if low_num <= 6:
-            has_primary = True
-        if low_num >= 7:
-            has_secondary = True
-
-    if high_num is not None:
-        if high_num <= 6:
-            has_primary = True
-        if high_num >= 7:
-            has_secondary = True
-
-    if has_primary and has_secondary:
-        return "combined"
-    if has_primary:
-        return "primary"
-    if has_secondary:
-        return "secondary"
-    return "other"
+    early_years = ["KIN", "PP", "P"]
+
+    has_primary = (
+        low.isin(early_years)
+        | high.isin(early_years)
+        | (low_num <= 6)
+        | (high_num <= 6)
+    ).to_numpy(dtype=bool)
+    has_secondary = ((low_num >= 7) | (high_num >= 7)).to_numpy(dtype=bool)
+
+    return np.select(
+        [has_primary & has_secondary, has_primary, has_secondary],
+        ["combined", "primary", "secondary"],
+        default="other",
+    )
 
 
+@functools.cache
 def _normalize_school_name(name: str | None) -> str:
     if not name:
         return ""
     base = name.split(",")[0]
-    base = re.sub(r"\.*(?>\(.*$)", " ", base).strip().upper()
+    base = _PAREN_SUFFIX_RE.sub(" ", base).strip().upper()
     return base
 
 
-def _levenshtein_distance(a: str, b: str) -> int:
-    if a == b:
-        return 0
-    if not a:
-        return len(b)
-    if not b:
-        return len(a)
-    prev = list(range(len(b) + 1))
-    for i, ca in enumerate(a, 1):
-        cur = [i]
-        for j, cb in enumerate(b, 1):
-            cost = 0 if ca == cb else 1
-            cur.append(min(cur[-1] + 1, prev[j] + 1, prev[j - 1] + cost))
-        prev = cur
-    return prev[-1]
-
-
-def _find_best_ranking_match(
-    name_key: str, ranking_data: dict[str, dict], max_ratio=0.25
-):
-    if not name_key:
-        return None, None
-    if name_key in ranking_data:
-        return ranking_data[name_key], name_key
-    best_entry = None
-    best_ratio = None
-    best_candidate = None
-    for candidate, entry in ranking_data.items():
-        distance = _levenshtein_distance(name_key, candidate)
-        longest = max(len(name_key), len(candidate)) or 1
-        ratio = distance / longest
-        if best_ratio is None or ratio < best_ratio:
-            best_ratio = ratio
-            best_entry = entry
-            best_candidate = candidate
-    if best_ratio is not None and best_ratio <= max_ratio:
-        return best_entry, best_candidate
-    return None, None
+def _iter_ranking_rows(path: Path, chunk_size: int = 1 << 16):
+    # The export is a bare run of <tr> fragments with no root element.
+    parser = etree.XMLPullParser(events=("end",), tag="tr")
+    parser.feed(b"<root>")
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                parser.feed(b"</root>")
+            else:
+                parser.feed(chunk)
+            for _, tr in parser.read_events():
+                yield ["".join(td.itertext()).strip() for td in tr.findall("td")]
+                tr.clear()
+                while tr.getprevious() is not None:
+                    del tr.getparent()[0]
+            if not chunk:
+                break
+    parser.close()
 
 
 def load_school_rankings(path: Path):
     if not path.exists():
         raise FileNotFoundError(f"Ranking XML not found: {path}")
-    text = path.read_text(encoding="utf-8")
-    wrapper = f"<root>{text}</root>"
-    root = ET.fromstring(wrapper)
     rankings = {}
-    for tr in root.findall(".//tr"):
-        cells = ["".join(td.itertext()).strip() for td in tr.findall("td")]
+    for cells in _iter_ranking_rows(path):
         if not cells or len(cells) < 5:
             continue
         try:
@@ -238,6 +248,9 @@ def load_school_rankings(path: Path):
                 return None
 
         key = _normalize_school_name(name)
+        if not key:
+            # e.g. "(Closed) ..."; would match every blank school name.
+            continue
         rankings[key] = {
             "ranking_rank": rank,
             "ranking_locality": locality,
@@ -250,7 +263,7 @@ def load_school_rankings(path: Path):
     return rankings
 
 
-def _merge_school_rankings(gdf: gpd.GeoDataFrame):
+def _merge_school_rankings(gdf: gpd.GeoDataFrame, max_ratio=0.25):
     ranking_fields = [
         "ranking_rank",
         "ranking_locality",
@@ -276,22 +289,70 @@ def _merge_school_rankings(gdf: gpd.GeoDataFrame):
         print(f"Warning: failed to parse ranking XML: {exc}")
         return
 
-    matched = 0
-    for idx, row in gdf.iterrows():
-        key = _normalize_school_name(row.get("schoolname"))
-        entry, matched_name = _find_best_ranking_match(key, ranking_data)
-        if entry:
-            matched += 1
-            for field, value in entry.items():
-                gdf.at[idx, field] = value
-            gdf.at[idx, "matched_key"] = matched_name
-    print(f"Attached ranking metadata to {matched} of {len(gdf)} schools.")
+    if "schoolname" in gdf.columns:
+        keys = gdf["schoolname"].map(_normalize_school_name).tolist()
+    else:
+        keys = [""] * len(gdf)
+    candidates = list(ranking_data.keys())
+    if not keys or not candidates:
+        print(f"Attached ranking metadata to 0 of {len(gdf)} schools.")
+        return
+
+    matches = {key: key for key in keys if key and key in ranking_data}
+    fuzzy_keys = sorted({key for key in keys if key and key not in matches})
+    if fuzzy_keys:
+        # Pairs that cannot beat max_ratio come back as 1.0.
+        distances = process.cdist(
+            fuzzy_keys,
+            candidates,
+            scorer=Levenshtein.normalized_distance,
+            score_cutoff=max_ratio,
+            workers=-1,
+        )
+        best = distances.argmin(axis=1)
+        best_ratio = distances[np.arange(len(fuzzy_keys)), best]
+        for key, idx, ratio in zip(fuzzy_keys, best, best_ratio):
+            if ratio <= max_ratio:
+                matches[key] = candidates[idx]
+
+    matched_names = np.array([matches.get(key) for key in keys], dtype=object)
+    mask = np.array([name is not None for name in matched_names], dtype=bool)
+    entries = [ranking_data.get(name, {}) for name in matched_names]
+    for field in ranking_fields[:-1]:
+        values = np.array([entry.get(field) for entry in entries], dtype=object)
+        gdf[field] = np.where(mask, values, gdf[field].to_numpy(dtype=object))
+    gdf["matched_key"] = np.where(
+        mask, matched_names, gdf["matched_key"].to_numpy(dtype=object)
+    )
+    print(f"Attached ranking metadata to {int(mask.sum())} of {len(gdf)} schools.")
+
+
+def _to_wgs84(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    # to_crs only skips identical CRS definitions, not equivalent ones.
+    if gdf.crs is not None and gdf.crs.to_epsg() == 4326:
+        return gdf
+    return gdf.to_crs(epsg=4326)
+
+
+def _points_to_wgs84(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    geoms = gdf.geometry
+    if (
+        gdf.crs is None
+        or gdf.crs.to_epsg() == 4326
+        or geoms.isna().any()
+        or not (geoms.geom_type == "Point").all()
+        or geoms.is_empty.any()
+        or geoms.has_z.any()
+    ):
+        return _to_wgs84(gdf)
+    transformer = pyproj.Transformer.from_crs(gdf.crs, 4326, always_xy=True)
+    lon, lat = transformer.transform(geoms.x.to_numpy(), geoms.y.to_numpy())
+    return gdf.set_geometry(gpd.points_from_xy(lon, lat, crs=4326))
 
 
 def _load_catchment_layer(path: Path, level: str):
     if not path.exists():
         raise FileNotFoundError(path)
-    gdf = gpd.read_file(path).to_crs(epsg=4326)
     rename_map = {
         "School": "schoolname",
         "Type": "catchment_type",
@@ -299,12 +360,15 @@ def _load_catchment_layer(path: Path, level: str):
         "Score": "catchment_score",
         "ScoreStrat": "catchment_score_strat",
     }
+    gdf = _to_wgs84(
+        pyogrio.read_dataframe(path, columns=list(rename_map), use_arrow=USE_ARROW)
+    )
     existing = {k: v for k, v in rename_map.items() if k in gdf.columns}
     gdf = gdf.rename(columns=existing)
     if "schoolname" not in gdf.columns:
         raise ValueError(f"'School' column missing from {path.name}")
     gdf["catchment_level"] = level
-    gdf["school_key"] = gdf["schoolname"].apply(_normalize_school_name)
+    gdf["school_key"] = gdf["schoolname"].map(_normalize_school_name)
     for col in [
         "catchment_type",
         "catchment_notes",
@@ -326,95 +390,164 @@ def _load_catchment_layer(path: Path, level: str):
     return gdf[keep_cols]
 
 
-def convert_sa1(ste_names: list[str] | None = None):
+def _source_parts(path: Path) -> list[Path]:
+    parts = [path]
+    if path.suffix.lower() == ".shp":
+        parts.extend(path.with_suffix(ext) for ext in SHAPEFILE_SIDECARS)
+    return [p for p in parts if p.exists()]
+
+
+def _needs_rebuild(out: Path, inputs: list[Path]) -> bool:
+    if not out.exists():
+        return True
+    built = out.stat().st_mtime_ns
+    paths = []
+    for path in inputs:
+        paths.extend(_source_parts(path))
+    return any(p.stat().st_mtime_ns > built for p in paths)
+
+
+def _prune_cache(pattern: str, keep: Path):
+    for stale in CACHE_DIR.glob(pattern):
+        if stale != keep:
+            stale.unlink(missing_ok=True)
+
+
+def _sa1_cache_path(states: list[str]) -> Path:
+    signature = (
+        tuple((p.suffix, p.stat().st_mtime_ns) for p in _source_parts(SA1_SHP)),
+        SEIFA_XLS.stat().st_mtime_ns,
+        tuple(SA1_COLUMNS),
+        tuple(states),
+    )
+    digest = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"sa1_{digest}.parquet"
+
+
+def _build_sa1_frame(states: list[str]):
+    where = None
+    if states:
+        # OGR's own attribute filter has no LOWER(); the SQLite dialect does.
+        literals = ", ".join(
+            "'{}'".format(name.lower().replace("'", "''")) for name in states
+        )
+        where = f"LOWER(STE_NAME21) IN ({literals})"
+
+    # Other attributes are unused and bloat the GeoJSON.
+    if where:
+        sql = 'SELECT {}, GEOMETRY FROM "{}" WHERE {}'.format(
+            ", ".join(SA1_COLUMNS), SA1_SHP.stem, where
+        )
+        gdf = pyogrio.read_dataframe(
+            SA1_SHP, sql=sql, sql_dialect="SQLITE", use_arrow=USE_ARROW
+        )
+    else:
+        gdf = pyogrio.read_dataframe(SA1_SHP, columns=SA1_COLUMNS, use_arrow=USE_ARROW)
+    if where:
+        print(
+            f"  Filtered SA1 polygons by STE_NAME21, keeping {len(gdf)} matching rows."
+        )
+        if gdf.empty:
+            print(
+                "  Warning: STE_NAME21 filter returned no rows. "
+                "Check the provided values."
+            )
+
+    seifa_df = _load_seifa_table_cached(SEIFA_XLS).set_index("SA1_CODE21")
+    seifa_df.index = seifa_df.index.astype(gdf["SA1_CODE21"].dtype)
+    gdf = gdf.join(seifa_df, on="SA1_CODE21", how="left")
+    return _to_wgs84(gdf)
+
+
+def convert_sa1(
+    ste_names: list[str] | None = None,
+    force: bool = False,
+    simplify_tolerance: float = 0.0,
+):
     if not SA1_SHP.exists():
         raise FileNotFoundError(f"SA1 shapefile missing: {SA1_SHP}")
     if not SEIFA_XLS.exists():
         raise FileNotFoundError(f"SEIFA workbook missing: {SEIFA_XLS}")
 
     print("Converting SA1 shapefile to GeoJSON...")
-    gdf = gpd.read_file(SA1_SHP)
-
+    normalized = []
     if ste_names:
-        if "STE_NAME21" not in gdf.columns:
+        if "STE_NAME21" not in pyogrio.read_info(SA1_SHP)["fields"]:
             raise ValueError(
                 "STE_NAME21 column missing from SA1 dataset; cannot filter by state."
             )
         normalized = sorted(
             {name.strip().lower() for name in ste_names if name and name.strip()}
         )
-        if normalized:
-            gdf = gdf[
-                gdf["STE_NAME21"].astype(str).str.strip().str.lower().isin(normalized)
-            ]
-            print(
-                "  Filtered SA1 polygons by STE_NAME21, keeping "
-                f"{len(gdf)} matching rows."
-            )
-            if gdf.empty:
-                print(
-                    "  Warning: STE_NAME21 filter returned no rows. "
-                    "Check the provided values."
-                )
-
-    seifa_df = _load_seifa_table(SEIFA_XLS)
-    gdf = gdf.merge(seifa_df, on="SA1_CODE21", how="left")
-    # Drop LOCI URI metadata – it is large, unused, and bloats the GeoJSON.
-    gdf = gdf.drop(
-        columns=[
-            "CHG_FLAG21",
-            "CHG_LBL21",
-            "SA2_CODE21",
-            "SA3_CODE21",
-            "SA4_CODE21",
-            "GCC_CODE21",
-            "STE_CODE21",
-            "AUS_CODE21",
-            "AREASQKM21",
-            "LOCI_URI21",
-            "AUS_NAME21"
-            "SA4_NAME21",
-            "GCC_NAME21"
-        ],
-        errors="ignore",
-    )
-    gdf = gdf.to_crs(epsg=4326)
+
+    cache_path = _sa1_cache_path(normalized)
+    # Rebuild when --state or --simplify changes, not just the sources.
+    source_marker = CACHE_DIR / "sa1_output.source"
+    output_source = f"{cache_path.name} simplify={simplify_tolerance:g}"
+    if (
+        not force
+        and SA1_OUT.exists()
+        and source_marker.exists()
+        and source_marker.read_text(encoding="utf-8") == output_source
+    ):
+        print(f"  {SA1_OUT} is up to date; skipping (use --force to rebuild).")
+        return
+    if cache_path.exists():
+        print(f"  Reusing cached SA1 + SEIFA merge from {cache_path}")
+        gdf = gpd.read_parquet(cache_path)
+    else:
+        gdf = _build_sa1_frame(normalized)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        gdf.to_parquet(cache_path)
+        _prune_cache("sa1_*.parquet", cache_path)
+    if simplify_tolerance > 0:
+        # Per polygon, so neighbouring SA1s may no longer share exact edges.
+        gdf["geometry"] = gdf.geometry.simplify(
+            simplify_tolerance, preserve_topology=True
+        )
+        print(
+            f"  Simplified SA1 geometries with tolerance {simplify_tolerance:g} degrees."
+        )
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    gdf.to_file(SA1_OUT, driver="GeoJSON")
+    gdf.to_file(SA1_OUT, driver="GeoJSON", engine="pyogrio")
+    source_marker.write_text(output_source, encoding="utf-8")
     print(f"Saved SA1 GeoJSON to {SA1_OUT}")
 
 
-def convert_transit():
+def convert_transit(force: bool = False):
     if not TRANSIT_SHP.exists():
         raise FileNotFoundError(f"Transit shapefile missing: {TRANSIT_SHP}")
     print("Converting transit services shapefile to GeoJSON...")
-    gdf = gpd.read_file(TRANSIT_SHP).to_crs(epsg=4326)
+    if not force and not _needs_rebuild(TRANSIT_OUT, [TRANSIT_SHP]):
+        print(f"  {TRANSIT_OUT} is up to date; skipping (use --force to rebuild).")
+        return
+    gdf = _points_to_wgs84(pyogrio.read_dataframe(TRANSIT_SHP, use_arrow=USE_ARROW))
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    gdf.to_file(TRANSIT_OUT, driver="GeoJSON")
+    gdf.to_file(TRANSIT_OUT, driver="GeoJSON", engine="pyogrio")
     print(f"Saved transit GeoJSON to {TRANSIT_OUT}")
 
 
-def convert_schools():
+def convert_schools(force: bool = False):
     if not SCHOOLS_SHP.exists():
         raise FileNotFoundError(f"Schools shapefile missing: {SCHOOLS_SHP}")
     print("Converting schools shapefile to GeoJSON...")
-    gdf = gpd.read_file(SCHOOLS_SHP).to_crs(epsg=4326)
+    if not force and not _needs_rebuild(SCHOOLS_OUT, [SCHOOLS_SHP, SCHOOL_RANKING_XML]):
+        print(f"  {SCHOOLS_OUT} is up to date; skipping (use --force to rebuild).")
+        return
+    gdf = _points_to_wgs84(pyogrio.read_dataframe(SCHOOLS_SHP, use_arrow=USE_ARROW))
     if "lowyear" in gdf.columns and "highyear" in gdf.columns:
-        gdf["stage"] = gdf.apply(
-            lambda row: _compute_school_stage(row.get("lowyear"), row.get("highyear")),
-            axis=1,
-        )
+        gdf["stage"] = _compute_school_stages(gdf["lowyear"], gdf["highyear"])
     else:
         gdf["stage"] = "other"
 
     _merge_school_rankings(gdf)
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    gdf.to_file(SCHOOLS_OUT, driver="GeoJSON")
+    gdf.to_file(SCHOOLS_OUT, driver="GeoJSON", engine="pyogrio")
     print(f"Saved schools GeoJSON to {SCHOOLS_OUT}")
 
 
-def convert_catchments():
+def convert_catchments(force: bool = False):
     missing = [
         path
         for path in [PRIMARY_CATCHMENTS_SHP, HIGH_CATCHMENTS_SHP]
@@ -425,11 +558,16 @@ def convert_catchments():
         raise FileNotFoundError(f"Catchment shapefile(s) missing: {missing_str}")
 
     print("Merging primary and high school catchment polygons...")
+    if not force and not _needs_rebuild(
+        CATCHMENTS_OUT, [PRIMARY_CATCHMENTS_SHP, HIGH_CATCHMENTS_SHP]
+    ):
+        print(f"  {CATCHMENTS_OUT} is up to date; skipping (use --force to rebuild).")
+        return
     primary = _load_catchment_layer(PRIMARY_CATCHMENTS_SHP, "primary")
     high = _load_catchment_layer(HIGH_CATCHMENTS_SHP, "high")
     catchments = pd.concat([primary, high], ignore_index=True)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    catchments.to_file(CATCHMENTS_OUT, driver="GeoJSON")
+    catchments.to_file(CATCHMENTS_OUT, driver="GeoJSON", engine="pyogrio")
     print(f"Saved school catchments GeoJSON to {CATCHMENTS_OUT}")
 
 
@@ -442,12 +580,20 @@ def _download_arcgis_layer(url: str, where: str = "1=1", out_fields: str = "*"):
     params = {"where": where or "1=1", "outFields": out_fields or "*", "f": "geojson"}
     separator = "&" if "?" in base else "?"
     query_url = f"{base}{separator}{urlencode(params)}"
-    with urlopen(query_url) as response:
-        data = json.load(response)
-    if "error" in data:
-        message = data["error"].get("message") or "Unknown ArcGIS error"
-        raise RuntimeError(f"ArcGIS download failed: {message}")
-    return data
+    request = Request(query_url, headers={"Accept-Encoding": "gzip"})
+    with urlopen(request) as response:
+        raw = response.read()
+        if response.headers.get("Content-Encoding", "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+    # ArcGIS reports failures as a top-level {"error": ...} object.
+    if not raw.lstrip().startswith(b"{"):
+        raise RuntimeError("ArcGIS download failed: response is not a JSON object")
+    if b'"error"' in raw[:200]:
+        data = orjson.loads(raw)
+        if "error" in data:
+            message = data["error"].get("message") or "Unknown ArcGIS error"
+            raise RuntimeError(f"ArcGIS download failed: {message}")
+    return raw
 
 
 def convert_arcgis_layers(definitions: list[str | dict], out_dir: Path = ARCGIS_OUT):
@@ -476,7 +622,8 @@ def convert_arcgis_layers(definitions: list[str | dict], out_dir: Path = ARCGIS_
             return last or f"arcgis_layer_{index}"
         return f"arcgis_layer_{index}"
 
-    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    used_names = set()
     for idx, entry in enumerate(definitions, start=1):
         if isinstance(entry, str):
             url = entry
@@ -493,15 +640,27 @@ def convert_arcgis_layers(definitions: list[str | dict], out_dir: Path = ARCGIS_
         safe_name = (
             re.sub(r"[^A-Za-z0-9_.-]+", "_", layer_name) or f"arcgis_layer_{idx}"
         )
+        if safe_name in used_names:
+            safe_name = f"{safe_name}_{idx}"
+        used_names.add(safe_name)
+        jobs.append((idx, url, where, out_dir / f"{safe_name}.geojson"))
         print(f"Downloading ArcGIS layer #{idx} ({safe_name}) from {url} ...")
+    if not jobs:
+        return
+
+    def export(job):
+        idx, url, where, out_path = job
         try:
-            geojson = _download_arcgis_layer(url, where=where)
+            payload = _download_arcgis_layer(url, where=where)
         except Exception as exc:
-            print(f"  Failed: {exc}")
-            continue
-        out_path = out_dir / f"{safe_name}.geojson"
-        out_path.write_text(json.dumps(geojson), encoding="utf-8")
-        print(f"  Saved to {out_path}")
+            return f"  Layer #{idx} failed: {exc}"
+        out_path.write_bytes(payload)
+        return f"  Saved layer #{idx} to {out_path}"
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=min(ARCGIS_MAX_WORKERS, len(jobs))) as pool:
+        for message in pool.map(export, jobs):
+            print(message)
 
 
 def _load_kmz_to_gdf(path: Path):
@@ -511,7 +670,9 @@ def _load_kmz_to_gdf(path: Path):
     if suffix != ".kmz":
         raise ValueError(f"Unsupported file type: {path}")
     with ZipFile(path, "r") as archive:
-        kml_names = [name for name in archive.namelist() if name.lower().endswith(".kml")]
+        kml_names = [
+            name for name in archive.namelist() if name.lower().endswith(".kml")
+        ]
         if not kml_names:
             raise ValueError("KMZ archive does not contain a KML file.")
         target_name = kml_names[0]
@@ -536,15 +697,20 @@ def convert_kmz_layers(files: list[str], out_dir: Path = ARCGIS_OUT):
         print(f"Converting KMZ/KML layer #{idx} ({safe_name}) from {path} ...")
         try:
             gdf = _load_kmz_to_gdf(path)
-            gdf = gdf.to_crs(epsg=4326)
+            gdf = _to_wgs84(gdf)
         except Exception as exc:
             print(f"  Failed: {exc}")
             continue
         out_path = out_dir / f"{safe_name}.geojson"
-        gdf.to_file(out_path, driver="GeoJSON")
+        gdf.to_file(out_path, driver="GeoJSON", engine="pyogrio")
         print(f"  Saved to {out_path}")
 
 
+def _report_failure(name: str, exc: BaseException):
+    print(f"{name} failed:")
+    print("".join(traceback.format_exception(exc)), end="")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert shapefiles into GeoJSON for faster runtime loading."
@@ -564,6 +730,16 @@ def main():
             "Repeat for multiple states."
         ),
     )
+    parser.add_argument(
+        "--simplify",
+        type=float,
+        default=0.0,
+        metavar="DEGREES",
+        help=(
+            "Simplify SA1 polygons to this tolerance in degrees before writing "
+            "(e.g. 0.0001 is roughly 10 m). Lossy; disabled by default."
+        ),
+    )
     parser.add_argument(
         "--transit",
         action="store_true",
@@ -589,6 +765,11 @@ def main():
         action="append",
         help="Path to a KMZ or KML file to convert into GeoJSON (saved under processed/arcgis_layers).",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild shapefile outputs even when they are newer than their inputs.",
+    )
     args = parser.parse_args()
 
     if not any(
@@ -603,18 +784,41 @@ def main():
     ):
         args.sa1 = args.transit = args.schools = args.catchments = True
 
+    tasks = []
     if args.sa1:
-        convert_sa1(args.states)
+        tasks.append((convert_sa1, (args.states, args.force, args.simplify)))
     if args.transit:
-        convert_transit()
+        tasks.append((convert_transit, (args.force,)))
     if args.schools:
-        convert_schools()
+        tasks.append((convert_schools, (args.force,)))
     if args.catchments:
-        convert_catchments()
-    if args.arcgis_url:
-        convert_arcgis_layers(args.arcgis_url)
-    if args.kmz_file:
-        convert_kmz_layers(args.kmz_file)
+        tasks.append((convert_catchments, (args.force,)))
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=max(1, min(4, len(tasks)))) as executor:
+        futures = {
+            executor.submit(func, *func_args): func.__name__
+            for func, func_args in tasks
+        }
+        local_tasks = []
+        if args.arcgis_url:
+            local_tasks.append((convert_arcgis_layers, args.arcgis_url))
+        if args.kmz_file:
+            local_tasks.append((convert_kmz_layers, args.kmz_file))
+        for func, func_arg in local_tasks:
+            try:
+                func(func_arg)
+            except Exception as exc:
+                _report_failure(func.__name__, exc)
+                failed.append(func.__name__)
+        wait(futures)
+    for future, name in futures.items():
+        exc = future.exception()
+        if exc is not None:
+            _report_failure(name, exc)
+            failed.append(name)
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -12,14 +12,17 @@ import type { Feature, FeatureCollection } from "geojson";
 import L from "leaflet";
 import type { GeoCollection, GeoFeature } from "./types";
 import { useMapData } from "./hooks/useMapData";
-import { buildTooltipFields, getMapCenter, makeSa1Style } from "./utils/geojson";
-import { fetchArcgisGeojson } from "./utils/loaders";
+import { buildTooltipFields, getMapCenter, groupByProperty, makeSa1Style } from "./utils/geojson";
+import { fetchArcgisGeojson, fetchProcessedLayer } from "./utils/loaders";
 import { loadKmzLayer } from "./utils/kmz";
 import { ArcgisImageLayer } from "./components/ArcgisImageLayer";
 import { formatValue, parsePercentile } from "./utils/schools";
+import { buildPointIndex, findNearest, haversineDistance } from "./utils/nearest";
 import "leaflet/dist/leaflet.css";
 
 const NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search";
+const NEARBY_RADIUS_KM = 4;
+const NEARBY_LIMIT = 5;
 
 const SCHOOL_DETAIL_FIELDS: Array<[string, string]> = [
   ["sector", "Sector"],
@@ -67,6 +70,18 @@ const SCHOOL_SECTOR_COLORS: Record<string, string> = {
   other: "#fb8500"
 };
 
+interface SchoolMarkerStyle {
+  color: string;
+  fillColor: string;
+  fillOpacity: number;
+}
+
+const DEFAULT_SCHOOL_MARKER_STYLE: SchoolMarkerStyle = {
+  color: SCHOOL_SECTOR_COLORS.other,
+  fillColor: SCHOOL_SECTOR_COLORS.other,
+  fillOpacity: 0.9
+};
+
 interface AddressPin {
   lat: number;
   lon: number;
@@ -100,7 +115,7 @@ function buildLiaPageUrl(code: string | number | null | undefined) {
   return `https://www.det.wa.edu.au/schoolsonline/localintakearea.do?schoolID=${clean}`;
 }
 
-async function geocodeQuery(query: string) {
+async function fetchGeocode(query: string) {
   const url = new URL(NOMINATIM_SEARCH_URL);
   url.searchParams.set("format", "json");
   url.searchParams.set("limit", "1");
@@ -125,16 +140,22 @@ async function geocodeQuery(query: string) {
   };
 }
 
-function haversineDistance(lat1: number, lon1: number, lat2: number, lon2: number) {
-  const R = 6371; // km
-  const toRad = (deg: number) => (deg * Math.PI) / 180;
-  const dLat = toRad(lat2 - lat1);
-  const dLon = toRad(lon2 - lon1);
-  const a =
-    Math.sin(dLat / 2) ** 2 +
-    Math.cos(toRad(lat1)) * Math.cos(toRad(lat2)) * Math.sin(dLon / 2) ** 2;
-  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
-  return R * c;
+// Nominatim's usage policy asks clients to avoid repeating identical queries,
+// so remember each lookup (including misses) for the session. Failed requests
+// are evicted so they can be retried.
+const geocodeCache = new Map<string, ReturnType<typeof fetchGeocode>>();
+
+function geocodeQuery(query: string) {
+  const key = query.trim().replace(/\s+/g, " ").toLowerCase();
+  let pending = geocodeCache.get(key);
+  if (!pending) {
+    pending = fetchGeocode(query).catch((error) => {
+      geocodeCache.delete(key);
+      throw error;
+    });
+    geocodeCache.set(key, pending);
+  }
+  return pending;
 }
 
 function App() {
@@ -188,16 +209,16 @@ function App() {
     return buildTooltipFields(data.metadata.propertyNames, data.metadata.seifaColumns);
   }, [data]);
 
+  // Keep the style callback stable so re-renders don't restyle every SA1 polygon.
+  const sa1Style = useMemo(() => makeSa1Style(data?.metadata.iradRange ?? null), [data]);
+
+  const sa1ByState = useMemo(() => (data ? groupByProperty(data.sa1, "STE_NAME21") : null), [data]);
+
   const filteredSa1 = useMemo(() => {
-    if (!data) return null;
-    const filtered = data.sa1.features?.filter((feature) => {
-      if (!selectedState) return true;
-      return (feature.properties || {}).STE_NAME21 === selectedState;
-    });
-    return filtered
-      ? ({ type: "FeatureCollection", features: filtered } as GeoCollection)
-      : data.sa1;
-  }, [data, selectedState]);
+    if (!data || !sa1ByState) return null;
+    if (!selectedState || !data.sa1.features) return data.sa1;
+    return sa1ByState.get(selectedState) ?? ({ type: "FeatureCollection", features: [] } as GeoCollection);
+  }, [data, sa1ByState, selectedState]);
 
   useEffect(() => {
     if (!selectedState || !selectedSa1) return;
@@ -207,18 +228,26 @@ function App() {
     }
   }, [selectedState, selectedSa1]);
 
+  // Parse each school's percentile once per load (NaN when missing) so the
+  // slider default and the filter below only compare numbers.
+  const schoolPercentiles = useMemo(() => {
+    const features = data?.schools?.features;
+    if (!features?.length) return null;
+    const values = new Float64Array(features.length);
+    features.forEach((feature, index) => {
+      values[index] = parsePercentile(feature.properties?.ranking_percentile) ?? NaN;
+    });
+    return values;
+  }, [data]);
+
   const schoolPercentileDefault = useMemo(() => {
-    if (!data?.schools?.features?.length) return null;
-    const values: number[] = [];
-    for (const feature of data.schools.features) {
-      const pct = parsePercentile(feature.properties?.ranking_percentile);
-      if (pct != null) {
-        values.push(pct);
-      }
+    if (!schoolPercentiles) return null;
+    let max = -Infinity;
+    for (const value of schoolPercentiles) {
+      if (value > max) max = value;
     }
-    if (!values.length) return null;
-    return Math.min(100, Math.max(...values));
-  }, [data]);
+    return max === -Infinity ? null : Math.min(100, max);
+  }, [schoolPercentiles]);
 
   useEffect(() => {
     if (percentileMax == null && schoolPercentileDefault != null) {
@@ -231,13 +260,10 @@ function App() {
     if (percentileMax == null) return data.schools.features;
     const defaultMax = schoolPercentileDefault ?? 100;
     const active = percentileMax < defaultMax;
-    if (!active) return data.schools.features;
-    return data.schools.features.filter((feature) => {
-      const pct = parsePercentile(feature.properties?.ranking_percentile);
-      if (pct == null) return false;
-      return pct <= percentileMax;
-    });
-  }, [data, percentileMax, schoolPercentileDefault]);
+    if (!active || !schoolPercentiles) return data.schools.features;
+    // NaN (no percentile) never satisfies the comparison, so those schools drop out.
+    return data.schools.features.filter((_, index) => schoolPercentiles[index] <= percentileMax);
+  }, [data, percentileMax, schoolPercentileDefault, schoolPercentiles]);
 
   const mapCenter = useMemo(() => {
     if (!data) return [-25.2744, 133.7751];
@@ -249,58 +275,20 @@ function App() {
     return { type: "FeatureCollection", features: [selectedSa1] } as GeoCollection;
   }, [selectedSa1]);
 
+  // Pack point coordinates once per load; lookups then prune by a degree window
+  // before paying for haversine on the survivors.
+  const schoolPointIndex = useMemo(() => buildPointIndex(data?.schools), [data?.schools]);
+  const stopPointIndex = useMemo(() => buildPointIndex(data?.stops), [data?.stops]);
+
   const nearestSchools = useMemo(() => {
-    if (!addressPin || !data?.schools?.features?.length) return [];
-    const { lat, lon } = addressPin;
-    const entries = data.schools.features
-      .map((feature) => {
-        const coords = feature.geometry?.type === "Point" ? feature.geometry.coordinates : null;
-        if (!coords || coords.length < 2) return null;
-        const [featLon, featLat] = coords;
-        if (
-          typeof featLat !== "number" ||
-          typeof featLon !== "number" ||
-          Number.isNaN(featLat) ||
-          Number.isNaN(featLon)
-        ) {
-          return null;
-        }
-        const distance = haversineDistance(lat, lon, featLat, featLon);
-        return { feature, distance };
-      })
-      .filter((item): item is { feature: GeoFeature; distance: number } => Boolean(item))
-      .filter((item) => item.distance <= 4)
-      .sort((a, b) => a.distance - b.distance)
-      .slice(0, 5);
-    return entries;
-  }, [addressPin, data?.schools?.features]);
+    if (!addressPin) return [];
+    return findNearest(schoolPointIndex, addressPin.lat, addressPin.lon, NEARBY_RADIUS_KM, NEARBY_LIMIT);
+  }, [addressPin, schoolPointIndex]);
 
   const nearestStops = useMemo(() => {
-    if (!addressPin || !data?.stops?.features?.length) return [];
-    const { lat, lon } = addressPin;
-    const entries = data.stops.features
-      .map((feature) => {
-        const coords =
-          feature.geometry?.type === "Point" ? (feature.geometry.coordinates as [number, number]) : null;
-        if (!coords || coords.length < 2) return null;
-        const [featLon, featLat] = coords;
-        if (
-          typeof featLat !== "number" ||
-          typeof featLon !== "number" ||
-          Number.isNaN(featLat) ||
-          Number.isNaN(featLon)
-        ) {
-          return null;
-        }
-        const distance = haversineDistance(lat, lon, featLat, featLon);
-        return { feature, distance };
-      })
-      .filter((item): item is { feature: GeoFeature; distance: number } => Boolean(item))
-      .filter((item) => item.distance <= 4)
-      .sort((a, b) => a.distance - b.distance)
-      .slice(0, 5);
-    return entries;
-  }, [addressPin, data?.stops?.features]);
+    if (!addressPin) return [];
+    return findNearest(stopPointIndex, addressPin.lat, addressPin.lon, NEARBY_RADIUS_KM, NEARBY_LIMIT);
+  }, [addressPin, stopPointIndex]);
 
   const importantPlaceDistances = useMemo(() => {
     if (!addressPin || !customPlaces.length) return [];
@@ -436,27 +424,23 @@ function App() {
   useEffect(() => {
     if (!missingProcessed.length || !data) return;
     let cancelled = false;
-    async function loadSelected() {
-      for (const name of missingProcessed) {
-        const entry = data.arcgisManifest.layers.find((layer) => layer.name === name);
-        if (!entry) continue;
-        try {
-          const response = await fetch(entry.file.startsWith("/") ? entry.file : `/${entry.file}`);
-          if (!response.ok) {
-            throw new Error(response.statusText);
-          }
-          const payload = (await response.json()) as GeoCollection;
+    // Load the selected layers concurrently. Each arrival re-runs this effect,
+    // and the shared requests keep those re-runs from fetching a file again.
+    for (const name of missingProcessed) {
+      const entry = data.arcgisManifest.layers.find((layer) => layer.name === name);
+      if (!entry) continue;
+      fetchProcessedLayer(entry.file)
+        .then((payload) => {
           if (!cancelled) {
             setProcessedLayerData((prev) => ({ ...prev, [name]: payload }));
           }
-        } catch (err) {
+        })
+        .catch((err: Error) => {
           if (!cancelled) {
-            setProcessedLayerError(`Failed to load ${name}: ${(err as Error).message}`);
+            setProcessedLayerError(`Failed to load ${name}: ${err.message}`);
           }
-        }
-      }
+        });
     }
-    loadSelected();
     return () => {
       cancelled = true;
     };
@@ -485,11 +469,29 @@ function App() {
     [sa1Tooltip]
   );
 
+  // Sector colours are fixed per school, so resolve each marker's path options
+  // once per load; stable objects also spare Leaflet a restyle when the
+  // percentile filter rebuilds the marker list.
+  const schoolMarkerStyles = useMemo(() => {
+    const styles = new Map<GeoFeature, SchoolMarkerStyle>();
+    const bySector = new Map<string, SchoolMarkerStyle>();
+    for (const feature of data?.schools?.features || []) {
+      const sector = (feature.properties?.sector || "other").toLowerCase();
+      let style = bySector.get(sector);
+      if (!style) {
+        const color = SCHOOL_SECTOR_COLORS[sector] || SCHOOL_SECTOR_COLORS.other;
+        style = { color, fillColor: color, fillOpacity: 0.9 };
+        bySector.set(sector, style);
+      }
+      styles.set(feature, style);
+    }
+    return styles;
+  }, [data?.schools]);
+
   const schoolMarkers = useMemo(() => {
     return filteredSchools.map((feature, index) => {
       const props = feature.properties || {};
-      const sector = (props.sector || "other").toLowerCase();
-      const color = SCHOOL_SECTOR_COLORS[sector] || SCHOOL_SECTOR_COLORS.other;
+      const pathOptions = schoolMarkerStyles.get(feature) ?? DEFAULT_SCHOOL_MARKER_STYLE;
       const position = feature.geometry?.coordinates;
       if (!position || !Array.isArray(position) || position.length < 2) return null;
       const [lon, lat] = position;
@@ -498,7 +500,7 @@ function App() {
           key={`school-${index}`}
           center={[lat, lon]}
           radius={5}
-          pathOptions={{ color, fillColor: color, fillOpacity: 0.9 }}
+          pathOptions={pathOptions}
           eventHandlers={{
             click: () => {
               setSelectedSchool(feature as GeoFeature);
@@ -514,7 +516,13 @@ function App() {
         </CircleMarker>
       );
     });
-  }, [filteredSchools]);
+  }, [filteredSchools, schoolMarkerStyles]);
+
+  // Build the selected school's links once per selection rather than twice each per render.
+  const selectedSchoolLinks = useMemo(() => {
+    const code = selectedSchool?.properties?.schoolcode;
+    return { map: buildLiaMapUrl(code), page: buildLiaPageUrl(code) };
+  }, [selectedSchool]);
 
   if (loading) {
     return <div className="map-loading">Loading map data…</div>;
@@ -662,6 +670,16 @@ function App() {
         {data.rankingWarning && <div className="alert warning">{data.rankingWarning}</div>}
         {data.transitWarning && <div className="alert warning">{data.transitWarning}</div>}
         {data.catchmentsWarning && <div className="alert warning">{data.catchmentsWarning}</div>}
+        <details>
+          <summary>Load timings</summary>
+          <ul className="detail-list">
+            {Object.entries(data.loadTimings).map(([name, ms]) => (
+              <li key={name}>
+                <strong>{name}:</strong> {ms.toFixed(0)} ms
+              </li>
+            ))}
+          </ul>
+        </details>
 
         <div className="section-title">ArcGIS layers</div>
         {data.arcgisManifest.layers.length ? (
@@ -839,7 +857,7 @@ function App() {
             <LayersControl position="topright">
               {filteredSa1 && (
                 <LayersControl.Overlay checked name="SA1 areas">
-                  <GeoJSON data={filteredSa1 as FeatureCollection} style={makeSa1Style(data.metadata.iradRange)} onEachFeature={sa1FeatureHandler} />
+                  <GeoJSON data={filteredSa1 as FeatureCollection} style={sa1Style} onEachFeature={sa1FeatureHandler} />
                 </LayersControl.Overlay>
               )}
               {selectedSa1Collection && (
@@ -935,20 +953,20 @@ function App() {
                 })}
               </ul>
               <div style={{ display: "flex", gap: "0.5rem", flexWrap: "wrap" }}>
-                {buildLiaMapUrl(selectedSchool.properties?.schoolcode) && (
+                {selectedSchoolLinks.map && (
                   <a
                     className="primary"
-                    href={buildLiaMapUrl(selectedSchool.properties?.schoolcode) || "#"}
+                    href={selectedSchoolLinks.map}
                     target="_blank"
                     rel="noreferrer"
                   >
                     Download intake map
                   </a>
                 )}
-                {buildLiaPageUrl(selectedSchool.properties?.schoolcode) && (
+                {selectedSchoolLinks.page && (
                   <a
                     className="secondary"
-                    href={buildLiaPageUrl(selectedSchool.properties?.schoolcode) || "#"}
+                    href={selectedSchoolLinks.page}
                     target="_blank"
                     rel="noreferrer"
                   >
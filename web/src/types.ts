@@ -28,6 +28,7 @@ export interface SchoolsSummary {
   sectorCounts: Record<string, number>;
   remoteCounts: Record<string, number>;
   stageCounts: Record<string, number>;
+  hasRanking: boolean;
 }
 
 export interface CatchmentsSummary {
@@ -50,6 +51,8 @@ export interface MapData {
   seifaWarning?: string;
   arcgisManifest: ArcgisManifest;
   stops: GeoCollection | null;
+  /** Milliseconds spent fetching and parsing each asset, plus client-side processing. */
+  loadTimings: Record<string, number>;
 }
 
 export interface ArcgisManifestEntry {
@@ -11,18 +11,33 @@ const STATE_CAPITALS: Record<string, [number, number]> = {
   "Western Australia": [-31.9559, 115.8606]
 };
 
-function flattenCoords(geometry: GeoJSON.Geometry | null | undefined, points: number[][]): void {
+type Bounds = [number, number, number, number];
+
+function emptyBounds(): Bounds {
+  return [Infinity, Infinity, -Infinity, -Infinity];
+}
+
+function extendPoint(bounds: Bounds, coord: number[]): void {
+  const [lon, lat] = coord;
+  if (Number.isFinite(lon) && Number.isFinite(lat)) {
+    if (lon < bounds[0]) bounds[0] = lon;
+    if (lat < bounds[1]) bounds[1] = lat;
+    if (lon > bounds[2]) bounds[2] = lon;
+    if (lat > bounds[3]) bounds[3] = lat;
+  }
+}
+
+function extendBounds(geometry: GeoJSON.Geometry | null | undefined, bounds: Bounds): void {
   if (!geometry) return;
   switch (geometry.type) {
     case "Point": {
-      const [lon, lat] = geometry.coordinates as number[];
-      points.push([lon, lat]);
+      extendPoint(bounds, geometry.coordinates as number[]);
       break;
     }
     case "MultiPoint":
     case "LineString": {
       for (const coord of geometry.coordinates as number[][]) {
-        points.push(coord as number[]);
+        extendPoint(bounds, coord);
       }
       break;
     }
@@ -30,7 +45,7 @@ function flattenCoords(geometry: GeoJSON.Geometry | null | undefined, points: nu
     case "Polygon": {
       for (const ring of geometry.coordinates as number[][][]) {
         for (const coord of ring) {
-          points.push(coord as number[]);
+          extendPoint(bounds, coord);
         }
       }
       break;
@@ -39,7 +54,7 @@ function flattenCoords(geometry: GeoJSON.Geometry | null | undefined, points: nu
       for (const polygon of geometry.coordinates as number[][][][]) {
         for (const ring of polygon) {
           for (const coord of ring) {
-            points.push(coord as number[]);
+            extendPoint(bounds, coord);
           }
         }
       }
@@ -47,7 +62,7 @@ function flattenCoords(geometry: GeoJSON.Geometry | null | undefined, points: nu
     }
     case "GeometryCollection": {
       for (const geom of geometry.geometries) {
-        flattenCoords(geom, points);
+        extendBounds(geom, bounds);
       }
       break;
     }
@@ -56,57 +71,46 @@ function flattenCoords(geometry: GeoJSON.Geometry | null | undefined, points: nu
   }
 }
 
-function computeBounds(collection: GeoCollection | GeoFeature[]): [number, number, number, number] | null {
-  const points: number[][] = [];
-  const features = Array.isArray(collection) ? collection : collection.features || [];
-  for (const feature of features) {
-    flattenCoords(feature.geometry, points);
-  }
-  if (!points.length) return null;
-  let minLon = Infinity;
-  let minLat = Infinity;
-  let maxLon = -Infinity;
-  let maxLat = -Infinity;
-  for (const [lon, lat] of points) {
-    if (Number.isFinite(lon) && Number.isFinite(lat)) {
-      minLon = Math.min(minLon, lon);
-      minLat = Math.min(minLat, lat);
-      maxLon = Math.max(maxLon, lon);
-      maxLat = Math.max(maxLat, lat);
-    }
-  }
-  if (!Number.isFinite(minLon) || !Number.isFinite(minLat) || !Number.isFinite(maxLon) || !Number.isFinite(maxLat)) {
-    return null;
-  }
-  return [minLon, minLat, maxLon, maxLat];
+function finalizeBounds(bounds: Bounds): Bounds | null {
+  return bounds.every((value) => Number.isFinite(value)) ? bounds : null;
 }
 
 export function buildMetadata(data: GeoCollection): MapMetadata {
   const propertyNames = new Set<string>();
   const sa2ByState: Record<string, Set<string>> = {};
+  const boundsByState: Record<string, Bounds> = {};
   const stateCenters: Record<string, [number, number]> = {};
-  const iradValues: number[] = [];
+  const totalBounds = emptyBounds();
+  let iradMin = Infinity;
+  let iradMax = -Infinity;
 
+  // One pass over the features: the total extent and each state's extent are
+  // grown in place, so no per-state re-filter or coordinate buffer is needed.
   for (const feature of data.features || []) {
     const props = feature.properties || {};
     Object.keys(props).forEach((name) => propertyNames.add(name));
     const state = props["STE_NAME21"] as string | undefined;
     const sa2 = props["SA2_NAME21"] as string | undefined;
+    extendBounds(feature.geometry, totalBounds);
     if (state) {
-      if (!sa2ByState[state]) sa2ByState[state] = new Set();
+      if (!sa2ByState[state]) {
+        sa2ByState[state] = new Set();
+        boundsByState[state] = emptyBounds();
+      }
       if (sa2) sa2ByState[state].add(sa2);
+      extendBounds(feature.geometry, boundsByState[state]);
     }
+    // Track the range as we go; spreading ~60k values into Math.min/max
+    // allocates a second array and can overflow the argument stack.
     const decile = Number(props["IRAD_decile"]);
     if (!Number.isNaN(decile)) {
-      iradValues.push(decile);
+      if (decile < iradMin) iradMin = decile;
+      if (decile > iradMax) iradMax = decile;
     }
   }
 
-  for (const [state, sa2] of Object.entries(sa2ByState)) {
-    const subset = (data.features || []).filter(
-      (feature) => (feature.properties || {})["STE_NAME21"] === state
-    );
-    const bounds = computeBounds(subset);
+  for (const [state, stateBounds] of Object.entries(boundsByState)) {
+    const bounds = finalizeBounds(stateBounds);
     if (bounds) {
       const [minLon, minLat, maxLon, maxLat] = bounds;
       stateCenters[state] = [
@@ -125,17 +129,32 @@ export function buildMetadata(data: GeoCollection): MapMetadata {
     sa2ByState: Object.fromEntries(
       Object.entries(sa2ByState).map(([state, values]) => [state, Array.from(values).sort()])
     ),
-    totalBounds: computeBounds(data),
+    totalBounds: finalizeBounds(totalBounds),
     stateCenters,
     propertyNames: Array.from(propertyNames),
     count: data.features?.length || 0,
-    iradRange: iradValues.length ? [Math.min(...iradValues), Math.max(...iradValues)] : null,
+    iradRange: iradMin <= iradMax ? [iradMin, iradMax] : null,
     seifaColumns
   };
 
   return metadata;
 }
 
+export function groupByProperty(collection: GeoCollection, key: string): Map<unknown, GeoCollection> {
+  // Partition once so per-value selections become a lookup instead of a scan.
+  const groups = new Map<unknown, GeoCollection>();
+  for (const feature of collection.features || []) {
+    const value = feature.properties?.[key];
+    let group = groups.get(value);
+    if (!group) {
+      group = { type: "FeatureCollection", features: [] };
+      groups.set(value, group);
+    }
+    group.features.push(feature);
+  }
+  return groups;
+}
+
 export function getMapCenter(meta: MapMetadata, state: string | null): [number, number] {
   if (state) {
     if (STATE_CAPITALS[state]) {
@@ -197,41 +216,53 @@ export function buildTooltipFields(propertyNames: string[], extra?: string[]) {
   };
 }
 
-function interpolateColor(a: [number, number, number], b: [number, number, number], t: number) {
-  return a.map((value, idx) => Math.round(value + (b[idx] - value) * t)) as [number, number, number];
-}
+type Rgb = [number, number, number];
 
 const GRADIENT = {
-  red: [215, 48, 39] as [number, number, number],
-  yellow: [254, 224, 139] as [number, number, number],
-  green: [26, 152, 80] as [number, number, number]
+  red: [215, 48, 39] as Rgb,
+  yellow: [254, 224, 139] as Rgb,
+  green: [26, 152, 80] as Rgb
 };
 
+// Two-digit hex for every channel value, so building a colour is three lookups.
+const HEX_BYTES = Array.from({ length: 256 }, (_, value) => value.toString(16).padStart(2, "0"));
+
+function interpolateHex(a: Rgb, b: Rgb, t: number) {
+  const r = Math.round(a[0] + (b[0] - a[0]) * t);
+  const g = Math.round(a[1] + (b[1] - a[1]) * t);
+  const bl = Math.round(a[2] + (b[2] - a[2]) * t);
+  return `#${HEX_BYTES[r]}${HEX_BYTES[g]}${HEX_BYTES[bl]}`;
+}
+
 export function colorForIradDecile(decile: number | string | null | undefined, range: [number, number] | null) {
   if (decile == null || !range) return "#b0bec5";
   const value = Number(decile);
   if (Number.isNaN(value)) return "#b0bec5";
   const [min, max] = range;
   const ratio = min === max ? 0.5 : Math.min(1, Math.max(0, (value - min) / (max - min)));
-  let rgb: [number, number, number];
   if (ratio <= 0.5) {
-    const local = ratio / 0.5;
-    rgb = interpolateColor(GRADIENT.red, GRADIENT.yellow, local);
-  } else {
-    const local = (ratio - 0.5) / 0.5;
-    rgb = interpolateColor(GRADIENT.yellow, GRADIENT.green, local);
+    return interpolateHex(GRADIENT.red, GRADIENT.yellow, ratio / 0.5);
   }
-  return `#${rgb.map((channel) => channel.toString(16).padStart(2, "0")).join("")}`;
+  return interpolateHex(GRADIENT.yellow, GRADIENT.green, (ratio - 0.5) / 0.5);
 }
 
 export function makeSa1Style(range: [number, number] | null) {
+  // Deciles take only a handful of values, so compute each colour once and
+  // hand every polygon in that decile the same style object.
+  const styles = new Map<unknown, { color: string; fillColor: string; weight: number; fillOpacity: number }>();
   return (feature: GeoFeature) => {
-    const color = colorForIradDecile(feature.properties?.["IRAD_decile"], range);
-    return {
-      color,
-      fillColor: color,
-      weight: 1,
-      fillOpacity: 0.45
-    };
+    const decile = feature.properties?.["IRAD_decile"];
+    let style = styles.get(decile);
+    if (!style) {
+      const color = colorForIradDecile(decile, range);
+      style = {
+        color,
+        fillColor: color,
+        weight: 1,
+        fillOpacity: 0.45
+      };
+      styles.set(decile, style);
+    }
+    return style;
   };
 }
@@ -2,6 +2,7 @@ import type {
   ArcgisManifest,
   CatchmentsSummary,
   GeoCollection,
+  GeoFeature,
   MapData,
   MapMetadata,
   SchoolsSummary,
@@ -17,8 +18,10 @@ const CATCHMENTS_FILE = "/school_catchments.geojson";
 const TRANSIT_FILE = "/transit_services.geojson";
 const STOPS_FILE = "/Stops_PTA_001_WA_GDA2020_Public.geojson";
 const ARCGIS_MANIFEST = "/arcgis_layers/index.json";
+const BUS_ROUTE_TYPES = new Set(["standard", "cat", "school"]);
 
-async function fetchJson<T>(path: string): Promise<T | null> {
+async function fetchJson<T>(path: string, timings?: Record<string, number>): Promise<T | null> {
+  const started = performance.now();
   try {
     const response = await fetch(path);
     if (!response.ok) {
@@ -29,6 +32,8 @@ async function fetchJson<T>(path: string): Promise<T | null> {
   } catch (error) {
     console.error(`Fetch error for ${path}`, error);
     return null;
+  } finally {
+    if (timings) timings[path] = performance.now() - started;
   }
 }
 
@@ -44,21 +49,25 @@ function groupTransitLayers(data: GeoCollection | null): TransitLayers {
     return "";
   };
 
-  const makeCollection = (predicate: (feature: Feature) => boolean): GeoCollection => ({
-    type: "FeatureCollection",
-    features: data.features.filter(predicate)
-  });
-
-  const train = makeCollection((feature) => routeType(feature) === "train");
-  const bus = makeCollection((feature) =>
-    ["standard", "cat", "school"].includes(routeType(feature))
-  );
-  const other = makeCollection((feature) => !["train", "standard", "cat", "school"].includes(routeType(feature)));
+  // Resolve each feature's route type once and bucket it in the same pass.
+  const train: GeoFeature[] = [];
+  const bus: GeoFeature[] = [];
+  const other: GeoFeature[] = [];
+  for (const feature of data.features) {
+    const type = routeType(feature);
+    if (type === "train") {
+      train.push(feature);
+    } else if (BUS_ROUTE_TYPES.has(type)) {
+      bus.push(feature);
+    } else {
+      other.push(feature);
+    }
+  }
 
   const layers: TransitLayers = {};
-  if (train.features.length) layers.train = train;
-  if (bus.features.length) layers.bus = bus;
-  if (other.features.length) layers.other = other;
+  if (train.length) layers.train = { type: "FeatureCollection", features: train };
+  if (bus.length) layers.bus = { type: "FeatureCollection", features: bus };
+  if (other.length) layers.other = { type: "FeatureCollection", features: other };
   if (!layers.train && !layers.bus && !layers.other) {
     layers.all = data;
   }
@@ -74,18 +83,20 @@ function summarizeCatchments(data: GeoCollection | null): {
     return { layers: {}, summary: null, warning: "Catchment GeoJSON not found or empty." };
   }
 
+  // Read each feature's level once; bucket order fixes the layer order.
+  const buckets: Record<string, GeoFeature[]> = { primary: [], high: [], other: [] };
+  for (const feature of data.features) {
+    const level = (feature.properties || {}).catchment_level;
+    if (typeof level === "string" && Object.hasOwn(buckets, level)) {
+      buckets[level].push(feature);
+    }
+  }
   const layers: Record<string, GeoCollection> = {};
-  const collect = (level: string) => {
-    const features = data.features.filter(
-      (feature) => (feature.properties || {}).catchment_level === level
-    );
+  for (const [level, features] of Object.entries(buckets)) {
     if (features.length) {
       layers[level] = { type: "FeatureCollection", features };
     }
-  };
-  collect("primary");
-  collect("high");
-  collect("other");
+  }
 
   const summary: CatchmentsSummary = {
     count: data.features.length,
@@ -95,14 +106,39 @@ function summarizeCatchments(data: GeoCollection | null): {
   return { layers, summary };
 }
 
-async function loadArcgisManifest(): Promise<ArcgisManifest> {
-  const manifest = await fetchJson<ArcgisManifest>(ARCGIS_MANIFEST);
+async function loadArcgisManifest(timings?: Record<string, number>): Promise<ArcgisManifest> {
+  const manifest = await fetchJson<ArcgisManifest>(ARCGIS_MANIFEST, timings);
   if (!manifest) {
     return { layers: [] };
   }
   return manifest;
 }
 
+const processedLayerRequests = new Map<string, Promise<GeoCollection>>();
+
+// Processed layers are static assets: fetch and parse each file at most once,
+// sharing the in-flight request between callers. Failures are evicted so a
+// later toggle can retry.
+export function fetchProcessedLayer(file: string): Promise<GeoCollection> {
+  const path = file.startsWith("/") ? file : `/${file}`;
+  let pending = processedLayerRequests.get(path);
+  if (!pending) {
+    pending = fetch(path)
+      .then(async (response) => {
+        if (!response.ok) {
+          throw new Error(response.statusText);
+        }
+        return (await response.json()) as GeoCollection;
+      })
+      .catch((error) => {
+        processedLayerRequests.delete(path);
+        throw error;
+      });
+    processedLayerRequests.set(path, pending);
+  }
+  return pending;
+}
+
 export async function fetchArcgisGeojson(url: string, where = "1=1", outFields = "*") {
   const target = url.trim().endsWith("/query") ? url.trim() : `${url.trim().replace(/\/?$/, "")}/query`;
   const params = new URLSearchParams({ where, outFields, f: "geojson" }).toString();
@@ -118,20 +154,22 @@ export async function fetchArcgisGeojson(url: string, where = "1=1", outFields =
   return data as GeoCollection;
 }
 
-export async function loadMapData(): Promise<MapData> {
+async function buildMapData(): Promise<MapData> {
+  const loadTimings: Record<string, number> = {};
   const [sa1, transitSource, schools, catchmentsSource, arcgisManifest, stops] = await Promise.all([
-    fetchJson<GeoCollection>(SA1_FILE),
-    fetchJson<GeoCollection>(TRANSIT_FILE),
-    fetchJson<GeoCollection>(SCHOOLS_FILE),
-    fetchJson<GeoCollection>(CATCHMENTS_FILE),
-    loadArcgisManifest(),
-    fetchJson<GeoCollection>(STOPS_FILE)
+    fetchJson<GeoCollection>(SA1_FILE, loadTimings),
+    fetchJson<GeoCollection>(TRANSIT_FILE, loadTimings),
+    fetchJson<GeoCollection>(SCHOOLS_FILE, loadTimings),
+    fetchJson<GeoCollection>(CATCHMENTS_FILE, loadTimings),
+    loadArcgisManifest(loadTimings),
+    fetchJson<GeoCollection>(STOPS_FILE, loadTimings)
   ]);
 
   if (!sa1) {
     throw new Error("SA1 dataset is required. Ensure assets are generated under /assets.");
   }
 
+  const processingStarted = performance.now();
   const metadata: MapMetadata = buildMetadata(sa1);
   const transit = groupTransitLayers(transitSource);
   const stagedSchools = ensureSchoolStages(schools);
@@ -140,15 +178,11 @@ export async function loadMapData(): Promise<MapData> {
     catchmentsSource
   );
   let rankingWarning: string | undefined;
-  if (stagedSchools?.features?.length) {
-    const hasRanking = stagedSchools.features.some(
-      (feature) => feature.properties && feature.properties.ranking_rank != null
-    );
-    if (!hasRanking) {
-      rankingWarning =
-        "Ranking attributes missing from processed schools GeoJSON. Re-run scripts/prep_geojson.py --schools with the ranking XML.";
-    }
+  if (schoolsSummary && !schoolsSummary.hasRanking) {
+    rankingWarning =
+      "Ranking attributes missing from processed schools GeoJSON. Re-run scripts/prep_geojson.py --schools with the ranking XML.";
   }
+  loadTimings.processing = performance.now() - processingStarted;
 
   return {
     sa1,
@@ -164,6 +198,22 @@ export async function loadMapData(): Promise<MapData> {
     rankingWarning,
     seifaWarning: metadata.seifaColumns.length ? undefined : "SEIFA fields missing from SA1 GeoJSON.",
     arcgisManifest,
-    stops
+    stops,
+    loadTimings
   };
 }
+
+let mapDataPromise: Promise<MapData> | null = null;
+
+// The processed assets are static for the lifetime of the page, so every caller
+// (including StrictMode's double-invoked effects) shares one fetch-and-parse.
+// A failed load is dropped so a later call can retry.
+export function loadMapData(): Promise<MapData> {
+  if (!mapDataPromise) {
+    mapDataPromise = buildMapData().catch((error) => {
+      mapDataPromise = null;
+      throw error;
+    });
+  }
+  return mapDataPromise;
+}
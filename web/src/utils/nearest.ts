@@ -0,0 +1,77 @@
+import type { GeoCollection, GeoFeature } from "../types";
+
+const EARTH_RADIUS_KM = 6371;
+
+export function haversineDistance(lat1: number, lon1: number, lat2: number, lon2: number) {
+  const R = EARTH_RADIUS_KM;
+  const toRad = (deg: number) => (deg * Math.PI) / 180;
+  const dLat = toRad(lat2 - lat1);
+  const dLon = toRad(lon2 - lon1);
+  const a =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos(toRad(lat1)) * Math.cos(toRad(lat2)) * Math.sin(dLon / 2) ** 2;
+  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+  return R * c;
+}
+
+export interface PointIndex {
+  features: GeoFeature[];
+  lats: Float64Array;
+  lons: Float64Array;
+}
+
+export interface NearestMatch {
+  feature: GeoFeature;
+  distance: number;
+}
+
+export function buildPointIndex(collection: GeoCollection | null | undefined): PointIndex | null {
+  if (!collection?.features?.length) return null;
+  const features: GeoFeature[] = [];
+  const lats: number[] = [];
+  const lons: number[] = [];
+  for (const feature of collection.features) {
+    const coords = feature.geometry?.type === "Point" ? feature.geometry.coordinates : null;
+    if (!coords || coords.length < 2) continue;
+    const [lon, lat] = coords;
+    if (typeof lat !== "number" || typeof lon !== "number" || Number.isNaN(lat) || Number.isNaN(lon)) {
+      continue;
+    }
+    features.push(feature);
+    lats.push(lat);
+    lons.push(lon);
+  }
+  return { features, lats: Float64Array.from(lats), lons: Float64Array.from(lons) };
+}
+
+export function findNearest(
+  index: PointIndex | null,
+  lat: number,
+  lon: number,
+  radiusKm: number,
+  limit: number
+): NearestMatch[] {
+  if (!index) return [];
+  // A degree window that can only exclude points farther than radiusKm, so the
+  // haversine pass below runs on a handful of candidates instead of every point.
+  // The tiny margin keeps rounding from dropping a point sitting exactly on the radius.
+  const angular = (radiusKm / EARTH_RADIUS_KM) * (1 + 1e-9);
+  const dLat = (angular * 180) / Math.PI;
+  const maxAbsLat = Math.min(90, Math.abs(lat) + dLat);
+  const minCos = Math.cos((maxAbsLat * Math.PI) / 180);
+  const lonRatio = minCos > 0 ? Math.sin(angular / 2) / minCos : Infinity;
+  const dLon = lonRatio < 1 ? (2 * Math.asin(lonRatio) * 180) / Math.PI : 180;
+
+  const { features, lats, lons } = index;
+  const matches: NearestMatch[] = [];
+  for (let i = 0; i < features.length; i += 1) {
+    if (Math.abs(lats[i] - lat) > dLat) continue;
+    const lonGap = Math.abs(lons[i] - lon) % 360;
+    if (Math.min(lonGap, 360 - lonGap) > dLon) continue;
+    const distance = haversineDistance(lat, lon, lats[i], lons[i]);
+    if (distance <= radiusKm) {
+      matches.push({ feature: features[i], distance });
+    }
+  }
+  return matches.sort((a, b) => a.distance - b.distance).slice(0, limit);
+}
@@ -40,17 +40,25 @@ function computeStage(lowYear?: string | null, highYear?: string | null) {
 
 export function ensureSchoolStages(collection: GeoCollection | null) {
   if (!collection) return null;
-  const mutated = collection.features?.map((feature) => {
+  // Only a few dozen distinct year ranges exist across thousands of schools.
+  const stageCache = new Map<string, string>();
+  // Features are annotated in place, so hand back the same collection rather
+  // than copying it and its feature array.
+  if (!collection.features) collection.features = [];
+  for (const feature of collection.features) {
     if (!feature.properties) feature.properties = {};
     if (!feature.properties.stage) {
-      feature.properties.stage = computeStage(
-        feature.properties?.lowyear,
-        feature.properties?.highyear
-      );
+      const { lowyear, highyear } = feature.properties;
+      const key = `${lowyear ?? ""}|${highyear ?? ""}`;
+      let stage = stageCache.get(key);
+      if (stage === undefined) {
+        stage = computeStage(lowyear, highyear);
+        stageCache.set(key, stage);
+      }
+      feature.properties.stage = stage;
     }
-    return feature;
-  });
-  return { ...collection, features: mutated || [] };
+  }
+  return collection;
 }
 
 export function summarizeSchools(collection: GeoCollection | null): SchoolsSummary | null {
@@ -63,6 +71,7 @@ export function summarizeSchools(collection: GeoCollection | null): SchoolsSumma
     combined: 0,
     other: 0
   };
+  let hasRanking = false;
 
   for (const feature of collection.features) {
     const props = feature.properties || {};
@@ -80,13 +89,17 @@ export function summarizeSchools(collection: GeoCollection | null): SchoolsSumma
     } else {
       stageCounts.other += 1;
     }
+    if (props.ranking_rank != null) {
+      hasRanking = true;
+    }
   }
 
   return {
     count: collection.features.length,
     sectorCounts,
     remoteCounts,
-    stageCounts
+    stageCounts,
+    hasRanking
   };
 }
 